@@ -1,8 +1,23 @@
 from rest_framework import serializers
 
+
+class AliasedCharField(serializers.CharField):
+    """CharField that prefers an alternate input key (e.g. frontend `from`)."""
+
+    def __init__(self, *args, alias=None, **kwargs):
+        self.alias = alias
+        super().__init__(*args, **kwargs)
+
+    def get_value(self, dictionary):
+        if self.alias is not None and self.alias in dictionary:
+            return dictionary.get(self.alias)
+        return super().get_value(dictionary)
+
+
 class PricingInputSerializer(serializers.Serializer):
-    origin = serializers.CharField(required=True)
-    destination = serializers.CharField(required=True)
+    # Accept frontend `from` / `to` directly and emit them as validated keys
+    origin = AliasedCharField(alias="from", source="from", required=True)
+    destination = AliasedCharField(alias="to", source="to", required=True)
     mapped_from = serializers.CharField(required=True)
     mapped_to = serializers.CharField(required=True)
     aircraft_id = serializers.IntegerField(required=True)
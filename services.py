@@ -7,9 +7,89 @@ structural / logical proof-of-work implementation, in line with
 ASR Aviation privacy, terms and conditions.
 """
 
-import json
+import functools
+import math
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from .utils import calc_airport_handling
+from typing import Optional, Tuple
+
+from .utils import (
+    airport_handling_components,
+    airport_handling_constants,
+    normalize_airport_cfg,
+    parse_json_bytes,
+)
+
+GST_RATE = 0.18
+PLATFORM_FEE = 15000.0
+BATCH_MAX_WORKERS = 8
+
+
+@dataclass(frozen=True, slots=True)
+class HandlingBreakdown:
+    """Per-airport handling components; fields after airport follow utils.HANDLING_FIELDS."""
+
+    airport: str
+    weight_mt_billed: int
+    landing: float
+    parking: float
+    udf: float
+    atc: float
+    total: float
+
+    def as_dict(self):
+        return {
+            "airport": self.airport,
+            "weight_mt_billed": self.weight_mt_billed,
+            "landing": self.landing,
+            "parking": self.parking,
+            "udf": self.udf,
+            "atc": self.atc,
+            "total": self.total,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PricingResult:
+    """Price estimate; immutable so memoized quotes can be shared safely."""
+
+    aircraft_model: str
+    hourly_rate: float
+    flight_hours: float
+    base_price: float
+    ops_cost: float
+    handling_total: float
+    handling_breakdown: Tuple[HandlingBreakdown, ...]
+    subtotal_after_market: float
+    platform_fee: float
+    gst_18_percent: float
+    final_price: float
+
+    # Response dict, built on first as_dict() call and reused by cache hits
+    _response: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    def as_dict(self):
+        """Plain dict for the API response (same keys as before); don't mutate it."""
+        response = self._response
+        if response is None:
+            response = {
+                "aircraft_model": self.aircraft_model,
+                "hourly_rate": self.hourly_rate,
+                "flight_hours": self.flight_hours,
+                "base_price": self.base_price,
+                "ops_cost": self.ops_cost,
+                "handling_total": self.handling_total,
+                "handling_breakdown": [h.as_dict() for h in self.handling_breakdown],
+                "subtotal_after_market": self.subtotal_after_market,
+                "platform_fee": self.platform_fee,
+                "gst_18_percent": self.gst_18_percent,
+                "final_price": self.final_price,
+            }
+            # Frozen dataclass: memoize through object.__setattr__
+            object.__setattr__(self, "_response", response)
+        return response
+
 
 BASE_DIR = Path(__file__).resolve().parent.parent  # backend/django_core/
 DATA_DIR = BASE_DIR.parent / "data"  # backend/data/
@@ -19,24 +99,123 @@ def _load_json(name):
     path = DATA_DIR / name
     if not path.exists():
         raise FileNotFoundError(f"Missing data file: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+    return parse_json_bytes(path.read_bytes())
+
+
+# JSON configs are loaded on first use rather than at import, so management
+# commands that merely import the app don't pay the disk + parse cost.
+@functools.cache
+def aircrafts():
+    return _load_json("aircrafts.json")
+
+
+@functools.cache
+def aircrafts_by_id():
+    # Index aircraft by id once so per-request lookups are O(1)
+    return {a["id"]: a for a in aircrafts()}
+
+
+@functools.cache
+def airports():
+    return {
+        code.upper(): normalize_airport_cfg(cfg)
+        for code, cfg in _load_json("pricing_airports.json").items()
+    }
+
+
+@functools.cache
+def airport_constants():
+    # Per-airport tariff folded into the tuple the shared handling formula
+    # consumes, so each stop skips the config dict lookups
+    return {
+        code: airport_handling_constants(cfg, normalized=True)
+        for code, cfg in airports().items()
+    }
 
 
-# Load JSON configs
-AIRCRAFTS = _load_json("aircrafts.json")
-AIRPORTS = _load_json("pricing_airports.json")
-OPS = _load_json("ops.json")
-MARKET = _load_json("market.json")
+@functools.cache
+def ops():
+    return _load_json("ops.json")
+
+
+@functools.cache
+def market():
+    return _load_json("market.json")
+
+
+# Config-derived constants, computed once instead of per request
+@functools.cache
+def ops_per_hr():
+    cfg = ops()
+    return float(
+        cfg["crew_cost_per_hr"]
+        + cfg["insurance_per_hr"]
+        + cfg["maintenance_per_hr"]
+    )
+
+
+@functools.cache
+def demand_factor():
+    return float(market().get("demand_factor", 1.0))
+
+
+# Backwards-compatible module attributes (services.AIRCRAFTS etc.)
+_LAZY_ATTRS = {
+    "AIRCRAFTS": aircrafts,
+    "AIRCRAFTS_BY_ID": aircrafts_by_id,
+    "AIRPORTS": airports,
+    "AIRPORT_CONSTANTS": airport_constants,
+    "OPS": ops,
+    "MARKET": market,
+    "OPS_PER_HR": ops_per_hr,
+    "DEMAND_FACTOR": demand_factor,
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        return _LAZY_ATTRS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def reload_config():
+    """Drop cached configs and memoized quotes so the JSON files are re-read."""
+    for accessor in _LAZY_ATTRS.values():
+        accessor.cache_clear()
+    pricing_service_cached.cache_clear()
 
 
 def pricing_service(valid_data):
-    mapped_from = valid_data["mapped_from"]
-    mapped_to = valid_data["mapped_to"]
-    aircraft_id = valid_data["aircraft_id"]
-    flight_hours = valid_data["flight_hours"]
-    passengers = valid_data["passengers"]
+    return pricing_service_cached(
+        valid_data["mapped_from"],
+        valid_data["mapped_to"],
+        valid_data["aircraft_id"],
+        valid_data["flight_hours"],
+        valid_data["passengers"],
+    )
+
+
+@functools.cache
+def _batch_executor():
+    # Shared pool, created on first batch call and reused afterwards
+    return ThreadPoolExecutor(max_workers=BATCH_MAX_WORKERS, thread_name_prefix="pricing")
+
+
+def pricing_service_batch(inputs):
+    """Price several validated inputs; results are returned in input order.
 
+    Quotes are independent, so they are dispatched to a thread pool. The
+    first failing quote's exception is raised to the caller.
+    """
+    if len(inputs) <= 1:
+        return [pricing_service(valid_data) for valid_data in inputs]
+    return list(_batch_executor().map(pricing_service, inputs))
+
+
+# Quotes depend only on these inputs and the (immutable) config, so repeated
+# requests are served from cache; PricingResult is frozen so sharing is safe.
+@functools.lru_cache(maxsize=4096)
+def pricing_service_cached(mapped_from, mapped_to, aircraft_id, flight_hours, passengers):
     # Create stops based on inputs (origin + destination)
     stops = [
         {
@@ -56,63 +235,59 @@ def pricing_service(valid_data):
     ]
 
     # Aircraft lookup
-    aircraft = next((a for a in AIRCRAFTS if a["id"] == aircraft_id), None)
+    aircraft = aircrafts_by_id().get(aircraft_id)
     if aircraft is None:
         raise ValueError(f"Unknown aircraft_id: {aircraft_id}")
 
     hourly_rate = float(aircraft["hourly_rate"])
     base_price = flight_hours * hourly_rate
 
-    ops_per_hr = float(
-        OPS["crew_cost_per_hr"]
-        + OPS["insurance_per_hr"]
-        + OPS["maintenance_per_hr"]
-    )
-    ops_cost = flight_hours * ops_per_hr
+    ops_cost = flight_hours * ops_per_hr()
 
     handling_breakdown = []
-    handling_total = 0.0
+    totals = []
+    tariffs = airport_constants()
 
     for s in stops:
         key = s["airport"].upper()
-        ap_cfg = AIRPORTS.get(key)
+        constants = tariffs.get(key)
 
-        if not ap_cfg:
+        if constants is None:
             raise ValueError(f"No tariff configured for airport: {s['airport']}")
 
-        h = calc_airport_handling(
-            ap_cfg,
-            s["mtow_kg"],
-            s["parking_hours"],
-            s["pax_departing"],
-            s["pax_arriving"]
+        # Components are passed positionally, so no intermediate dict per stop
+        breakdown = HandlingBreakdown(
+            s["airport"],
+            *airport_handling_components(
+                constants,
+                s["mtow_kg"],
+                s["parking_hours"],
+                s["pax_departing"],
+                s["pax_arriving"],
+            ),
         )
+        handling_breakdown.append(breakdown)
+        totals.append(breakdown.total)
 
-        handling_breakdown.append({
-            "airport": s["airport"],
-            **h
-        })
-        handling_total += h["total"]
+    # fsum: exactly rounded, independent of stop order
+    handling_total = math.fsum(totals)
 
-    subtotal = base_price + ops_cost + handling_total
-    subtotal *= float(MARKET.get("demand_factor", 1.0))
+    subtotal = (base_price + ops_cost + handling_total) * demand_factor()
 
-    gst = subtotal * 0.18
-    platform_fee = 15000.0
-    final = subtotal + gst + platform_fee
+    gst = subtotal * GST_RATE
+    # Summed from the reported parts so the breakdown adds up exactly
+    final = subtotal + gst + PLATFORM_FEE
 
-    return {
-        
-            "aircraft_model": aircraft["model"],
-            "hourly_rate": hourly_rate,
-            "flight_hours": flight_hours,
-            "base_price": base_price,
-            "ops_cost": ops_cost,
-            "handling_total": handling_total,
-            "handling_breakdown": handling_breakdown,
-            "subtotal_after_market": subtotal,
-            "platform_fee": platform_fee,
-            "gst_18_percent": gst,
-            "final_price": final
-        
-    }
+    return PricingResult(
+        aircraft_model=aircraft["model"],
+        hourly_rate=hourly_rate,
+        flight_hours=flight_hours,
+        base_price=base_price,
+        ops_cost=ops_cost,
+        handling_total=handling_total,
+        handling_breakdown=tuple(handling_breakdown),
+        subtotal_after_market=subtotal,
+        platform_fee=PLATFORM_FEE,
+        gst_18_percent=gst,
+        final_price=final,
+    )
@@ -1,3 +1,307 @@
-from django.test import TestCase
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+from rest_framework.test import APIRequestFactory
+
+from . import services, utils
+from .serializers import PricingInputSerializer
+from .utils import (
+    calc_airport_handling,
+    calc_airport_handling_batch,
+    calculate_distance,
+    calculate_distance_jit,
+    calculate_distance_vec,
+    get_airport_info,
+    get_time_based_factor,
+    load_json_data,
+    nearest_mt,
+)
+from .views import MAX_BATCH_SIZE, get_price_estimate, get_price_estimate_batch
+
+
+# Raw tariff as it appears in pricing_airports.json (numbers may be strings,
+# udf / atc_navigation_flat are optional)
+RAW_AIRPORT_CFG = {
+    "landing_per_mt": "100",
+    "landing_min": "1200",
+    "parking_per_mt_hr": "10",
+    "free_hours": "2",
+    "buffer_minutes": "30",
+}
+
+# Stand-in for the JSON files under data/
+CONFIG_FILES = {
+    "aircrafts.json": [
+        {"id": 1, "model": "Citation CJ2", "hourly_rate": 100000},
+        {"id": 2, "model": "Challenger 605", "hourly_rate": 250000},
+    ],
+    "pricing_airports.json": {"del": RAW_AIRPORT_CFG, "BOM": RAW_AIRPORT_CFG},
+    "ops.json": {"crew_cost_per_hr": 10000, "insurance_per_hr": 5000, "maintenance_per_hr": 5000},
+    "market.json": {"demand_factor": 1.0},
+}
+
+
+def estimate_payload(**overrides):
+    payload = {
+        "from": "DEL",
+        "to": "BOM",
+        "mapped_from": "DEL",
+        "mapped_to": "BOM",
+        "aircraft_id": 1,
+        "flight_hours": 2.5,
+        "passengers": 6,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def use_config_files(testcase, files):
+    """Serve services' JSON configs from `files` for the duration of a test."""
+    patcher = mock.patch.object(services, "_load_json", files.__getitem__)
+    patcher.start()
+    testcase.addCleanup(patcher.stop)
+    services.reload_config()
+    testcase.addCleanup(services.reload_config)
+
+
+class PricingInputSerializerTests(SimpleTestCase):
+    def test_frontend_keys_take_priority(self):
+        serializer = PricingInputSerializer(
+            data=estimate_payload(origin="JAI", destination="GOI")
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["from"], "DEL")
+        self.assertEqual(serializer.validated_data["to"], "BOM")
+
+    def test_falls_back_to_origin_destination(self):
+        payload = estimate_payload(origin="JAI", destination="GOI")
+        del payload["from"], payload["to"]
+        serializer = PricingInputSerializer(data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.validated_data["from"], "JAI")
+        self.assertEqual(serializer.validated_data["to"], "GOI")
+
+    def test_validated_keys_are_from_and_to(self):
+        serializer = PricingInputSerializer(data=estimate_payload())
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertIn("from", serializer.validated_data)
+        self.assertIn("to", serializer.validated_data)
+        self.assertNotIn("origin", serializer.validated_data)
+        self.assertNotIn("destination", serializer.validated_data)
+
+    def test_missing_origin_reports_origin_field(self):
+        payload = estimate_payload()
+        del payload["from"]
+        serializer = PricingInputSerializer(data=payload)
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("origin", serializer.errors)
+
+
+class AirportHandlingTests(SimpleTestCase):
+    def test_nearest_mt_rounds_half_up(self):
+        self.assertEqual(nearest_mt(11600), 12)
+        self.assertEqual(nearest_mt(11499.9), 11)
+        self.assertEqual(nearest_mt(12500), 13)
+
+    def test_nearest_mt_half_even(self):
+        self.assertEqual(nearest_mt(12500, half_even=True), 12)
+        self.assertEqual(nearest_mt(13500, half_even=True), 14)
+
+    def test_raw_config_without_optional_keys(self):
+        h = calc_airport_handling(RAW_AIRPORT_CFG, 0, 0, 3, 0)
+        self.assertEqual(h["landing"], 1200.0)
+        self.assertEqual(h["udf"], 0.0)
+        self.assertEqual(h["atc"], 0.0)
+        self.assertEqual(h["total"], 1200.0)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+    def test_batch_matches_scalar(self):
+        cfgs = [
+            RAW_AIRPORT_CFG,
+            {**RAW_AIRPORT_CFG, "udf": {"depart": 50, "arrive": 20}, "atc_navigation_flat": 300},
+            RAW_AIRPORT_CFG,
+        ]
+        mtow = [11600, 12500, 30499]
+        parking = [0, 5.0, 1.5]
+        pax_dep = [3, 0, 8]
+        pax_arr = [0, 6, 2]
+
+        batch = calc_airport_handling_batch(cfgs, mtow, parking, pax_dep, pax_arr)
+
+        for i, cfg in enumerate(cfgs):
+            scalar = calc_airport_handling(cfg, mtow[i], parking[i], pax_dep[i], pax_arr[i])
+            for key, value in scalar.items():
+                self.assertAlmostEqual(float(batch[key][i]), value, msg=f"stop {i} {key}")
+
+
+# Rounding puts the haversine term a hair above 1 for this pair
+ANTIPODAL_PAIR = (7.1854142205853435, 26.539588291711823, -7.1854142205853435, -153.46041170828818)
+
+# (lat1, lon1, lat2, lon2): DEL-BOM, JAI-GOI, same point, antipodal
+DISTANCE_PAIRS = [
+    (28.5562, 77.1000, 19.0896, 72.8656),
+    (26.8242, 75.8122, 15.3808, 73.8314),
+    (26.8242, 75.8122, 26.8242, 75.8122),
+    ANTIPODAL_PAIR,
+]
+
+
+class DistanceTests(SimpleTestCase):
+    def test_antipodal_points(self):
+        self.assertAlmostEqual(calculate_distance(*ANTIPODAL_PAIR), 20015.09, places=2)
+
+    def test_jit_matches_scalar(self):
+        for pair in DISTANCE_PAIRS:
+            self.assertAlmostEqual(calculate_distance_jit(*pair), calculate_distance(*pair), places=6)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "numpy not installed")
+    def test_vec_matches_scalar(self):
+        lat1, lon1, lat2, lon2 = zip(*DISTANCE_PAIRS)
+        distances = calculate_distance_vec(lat1, lon1, lat2, lon2)
+
+        self.assertEqual(len(distances), len(DISTANCE_PAIRS))
+        for distance, pair in zip(distances, DISTANCE_PAIRS):
+            self.assertAlmostEqual(float(distance), calculate_distance(*pair), places=6)
+
+
+class PricingFactorTests(SimpleTestCase):
+    def test_time_based_factor(self):
+        self.assertEqual(get_time_based_factor("06:00"), 1.2)
+        self.assertEqual(get_time_based_factor("9:30"), 1.2)
+        self.assertEqual(get_time_based_factor("22:15"), 1.0)
+        self.assertEqual(get_time_based_factor("23:59"), 0.9)
+
+    def test_time_based_factor_out_of_range_hour(self):
+        self.assertEqual(get_time_based_factor("24:00"), 1.0)
+        self.assertEqual(get_time_based_factor("-1:00"), 1.0)
+
+
+class LoadJsonDataTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(utils, "DATA_DIR", tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = os.path.join(tmp.name, "market.json")
+
+    def write(self, data, mtime):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_unchanged_file_is_served_from_cache(self):
+        self.write({"demand_factor": 1.0}, mtime=1_000_000)
+        self.assertIs(load_json_data("market.json"), load_json_data("market.json"))
+
+    def test_new_mtime_reparses_file(self):
+        self.write({"demand_factor": 1.0}, mtime=1_000_000)
+        self.assertEqual(load_json_data("market.json"), {"demand_factor": 1.0})
+
+        self.write({"demand_factor": 1.3}, mtime=1_000_060)
+        self.assertEqual(load_json_data("market.json"), {"demand_factor": 1.3})
+
+
+class AirportLookupTests(SimpleTestCase):
+    def test_duplicate_codes_return_first_match(self):
+        airports_data = {"airports": [{"code": "DEL", "n": 1}, {"code": "del", "n": 2}]}
+        self.assertEqual(get_airport_info("Del", airports_data)["n"], 1)
+
+
+class PricingServiceTests(SimpleTestCase):
+    def setUp(self):
+        use_config_files(self, CONFIG_FILES)
+
+    def test_reload_config_drops_memoized_quotes(self):
+        quote = services.pricing_service(estimate_payload())
+        self.assertEqual(quote.hourly_rate, 100000.0)
+
+        repriced = {
+            **CONFIG_FILES,
+            "aircrafts.json": [{"id": 1, "model": "Citation CJ2", "hourly_rate": 120000}],
+        }
+        with mock.patch.object(services, "_load_json", repriced.__getitem__):
+            # Still memoized until the config is reloaded
+            self.assertIs(services.pricing_service(estimate_payload()), quote)
+
+            services.reload_config()
+            self.assertEqual(services.pricing_service(estimate_payload()).hourly_rate, 120000.0)
+
+
+class PriceEstimateViewTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = APIRequestFactory()
+        use_config_files(self, CONFIG_FILES)
+
+    def test_invalid_payload_returns_errors_envelope(self):
+        request = self.factory.post("/estimate/", {"from": "DEL"}, format="json")
+        response = get_price_estimate(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {"errors"})
+        self.assertIn("aircraft_id", response.data["errors"])
+
+    def test_estimate(self):
+        request = self.factory.post("/estimate/", estimate_payload(), format="json")
+        response = get_price_estimate(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["aircraft_model"], "Citation CJ2")
+        self.assertEqual(
+            [h["airport"] for h in response.data["handling_breakdown"]], ["DEL", "BOM"]
+        )
+
+    def test_final_price_equals_breakdown_sum(self):
+        for flight_hours in (0.7, 1.3, 2.5, 3.9, 11.1):
+            result = services.pricing_service(estimate_payload(flight_hours=flight_hours))
+            self.assertEqual(
+                result.final_price,
+                result.subtotal_after_market + result.gst_18_percent + result.platform_fee,
+            )
+
+    def test_batch_preserves_input_order(self):
+        payload = [
+            estimate_payload(aircraft_id=2),
+            estimate_payload(aircraft_id=1),
+            estimate_payload(aircraft_id=2, flight_hours=1.0),
+        ]
+        request = self.factory.post("/estimate/batch/", payload, format="json")
+        response = get_price_estimate_batch(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["aircraft_model"] for r in response.data],
+            ["Challenger 605", "Citation CJ2", "Challenger 605"],
+        )
+        self.assertEqual([r["flight_hours"] for r in response.data], [2.5, 2.5, 1.0])
+
+    def test_batch_invalid_item_reports_errors_by_index(self):
+        payload = [estimate_payload(), {"from": "DEL"}]
+        request = self.factory.post("/estimate/batch/", payload, format="json")
+        response = get_price_estimate_batch(request)
+
+        self.assertEqual(response.status_code, 400)
+        # Older DRF returns a list with {} for valid items, newer a dict keyed
+        # by the index of each invalid item; both support errors[1]
+        self.assertIn("aircraft_id", response.data["errors"][1])
+
+    def test_batch_rejects_oversized_list(self):
+        payload = [estimate_payload()] * (MAX_BATCH_SIZE + 1)
+        request = self.factory.post("/estimate/batch/", payload, format="json")
+        response = get_price_estimate_batch(request)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.data)
+
+    def test_batch_pricing_error_returns_500(self):
+        payload = [estimate_payload(), estimate_payload(aircraft_id=999)]
+        request = self.factory.post("/estimate/batch/", payload, format="json")
+        response = get_price_estimate_batch(request)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("999", response.data["error"])
@@ -3,9 +3,10 @@ URL configuration for pricing app
 """
 
 from django.urls import path
-from .views import get_price_estimate
+from .views import get_price_estimate, get_price_estimate_batch
 
 
 urlpatterns = [
     path('estimate/', get_price_estimate, name='calculate_estimate'),
+    path('estimate/batch/', get_price_estimate_batch, name='calculate_estimate_batch'),
 ]
\ No newline at end of file
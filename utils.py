@@ -3,17 +3,83 @@ Utility functions for the pricing engine
 Helper functions for calculations and common operations
 """
 
+from __future__ import annotations
+
+import bisect
+import functools
 import json
 import os
 import math
-from datetime import datetime
-from typing import Dict, Any, Tuple
+from typing import TYPE_CHECKING, Dict, Any, List, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+# numpy / numba are imported inside the bulk helpers that need them, so
+# importing the app (manage.py, migrations) doesn't pay for them
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    import numpy as np
+
+# Mean radius of Earth in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Caches of values derived from config dicts, keyed by id(config). Entries
+# store the config itself and are checked by identity, so a recycled id()
+# never returns a stale value.
+_DERIVED_CACHE_SIZE = 32
+
+
+def _derived(cache: Dict[int, Tuple[Any, Any]], source: Any, build) -> Any:
+    """Return build(source), memoized per source object in cache."""
+    cached = cache.get(id(source))
+    if cached is not None and cached[0] is source:
+        return cached[1]
+
+    value = build(source)
+    if len(cache) >= _DERIVED_CACHE_SIZE:
+        cache.clear()
+    cache[id(source)] = (source, value)
+    return value
+
+
+def parse_json_bytes(raw: bytes) -> Any:
+    """
+    Parse raw JSON bytes, using orjson when it is installed
+    
+    Args:
+        raw (bytes): UTF-8 encoded JSON document
+        
+    Returns:
+        Any: Parsed JSON value (dicts / lists, same as json.loads)
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# Go up one level from this app to the project root, then into data directory
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_json_file(data_path: str, mtime: float) -> Any:
+    """Read and parse data_path; mtime is part of the key so edits invalidate."""
+    with open(data_path, 'rb') as file:
+        return parse_json_bytes(file.read())
 
 
 def load_json_data(filename: str) -> Dict[str, Any]:
     """
     Load JSON data from the data directory
     
+    Parsed files are cached and re-read only when their modification
+    time changes, so repeated calls are effectively free. The returned
+    object is shared between callers and must not be mutated.
+    
     Args:
         filename (str): Name of the JSON file to load
         
@@ -24,14 +90,10 @@ def load_json_data(filename: str) -> Dict[str, Any]:
         FileNotFoundError: If file doesn't exist
         json.JSONDecodeError: If file contains invalid JSON
     """
-    # Get the directory of the current file
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to the project root, then into data directory
-    data_path = os.path.join(os.path.dirname(current_dir), 'data', filename)
+    data_path = os.path.join(DATA_DIR, filename)
     
     try:
-        with open(data_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
+        return _parse_json_file(data_path, os.path.getmtime(data_path))
     except FileNotFoundError:
         raise FileNotFoundError(f"Data file not found: {data_path}")
     except json.JSONDecodeError as e:
@@ -43,6 +105,10 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Calculate the great circle distance between two points on Earth
     Using the Haversine formula
     
+    Deliberately uses `math` rather than numpy: for a single point the
+    math functions are several times faster than their numpy counterparts.
+    For many points use calculate_distance_vec (numpy) instead.
+    
     Args:
         lat1, lon1: Latitude and longitude of first point (in decimal degrees)
         lat2, lon2: Latitude and longitude of second point (in decimal degrees)
@@ -53,16 +119,94 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     # Convert decimal degrees to radians
     lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
     
-    # Haversine formula
+    # Haversine formula (atan2 form)
     dlat = lat2 - lat1
     dlon = lon2 - lon1
     a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    # Rounding can push a just above 1 for antipodal points; clamp before sqrt(1 - a)
+    a = min(a, 1.0)
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    
+    return c * EARTH_RADIUS_KM
+
+
+def _haversine_nb(lat1, lon1, lat2, lon2):
+    """Scalar Haversine kernel compiled by _haversine_kernel; floats only."""
+    lat1 = math.radians(lat1)
+    lon1 = math.radians(lon1)
+    lat2 = math.radians(lat2)
+    lon2 = math.radians(lon2)
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    # Clamp like calculate_distance: rounding can push a just above 1
+    return 2 * math.asin(math.sqrt(min(a, 1.0))) * EARTH_RADIUS_KM
+
+
+@functools.lru_cache(maxsize=None)
+def _haversine_kernel():
+    """Return _haversine_nb compiled with numba, or as-is if numba is missing."""
+    try:
+        from numba import njit
+    except ImportError:  # numba is optional; run the kernel as plain Python
+        return _haversine_nb
+    return njit(cache=True, fastmath=True)(_haversine_nb)
+
+
+def calculate_distance_jit(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Numba-compiled Haversine distance for tight loops over many routes
     
-    # Radius of Earth in kilometers
-    r = 6371
+    Inputs are coerced to float first so Decimal / int values never reach
+    the compiled kernel (which would trigger an object-mode fallback).
     
-    return c * r
+    Returns:
+        float: Distance in kilometers
+    """
+    return _haversine_kernel()(float(lat1), float(lon1), float(lat2), float(lon2))
+
+
+def calculate_distance_vec(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized Haversine distance for arrays of coordinate pairs
+    
+    Args:
+        lat1, lon1: Latitudes / longitudes of first points (array-like, decimal degrees)
+        lat2, lon2: Latitudes / longitudes of second points (array-like, decimal degrees)
+        
+    Returns:
+        np.ndarray: Distances in kilometers, one per pair
+    """
+    import numpy as np
+
+    lat1, lon1, lat2, lon2 = (
+        np.radians(np.asarray(x, dtype=float)) for x in (lat1, lon1, lat2, lon2)
+    )
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * np.arcsin(np.sqrt(np.minimum(a, 1.0))) * EARTH_RADIUS_KM
+
+
+_MONTH_NUMBERS = {
+    'january': 1, 'february': 2, 'march': 3, 'april': 4,
+    'may': 5, 'june': 6, 'july': 7, 'august': 8,
+    'september': 9, 'october': 10, 'november': 11, 'december': 12,
+}
+_MONTH_MULT_CACHE: Dict[int, Tuple[Dict, Tuple[float, ...]]] = {}
+
+
+def _build_month_mult(market_data: Dict) -> Tuple[float, ...]:
+    """Resolve seasonal_factors into a 13-entry table indexed by month (1-12)."""
+    month_mult = [1.0] * 13
+    resolved = set()
+    seasonal_factors = market_data.get('market_data', {}).get('seasonal_factors', {})
+    # First season listing a month wins, as in the original per-call scan
+    for data in seasonal_factors.values():
+        for month_name in data.get('months', []):
+            month = _MONTH_NUMBERS.get(month_name)
+            if month is not None and month not in resolved:
+                month_mult[month] = data.get('demand_multiplier', 1.0)
+                resolved.add(month)
+    return tuple(month_mult)
 
 
 def get_seasonal_factor(departure_date: datetime, market_data: Dict) -> float:
@@ -76,17 +220,8 @@ def get_seasonal_factor(departure_date: datetime, market_data: Dict) -> float:
     Returns:
         float: Seasonal multiplier (e.g., 1.4 for peak season)
     """
-    month_name = departure_date.strftime("%B").lower()
-    
-    seasonal_factors = market_data.get('market_data', {}).get('seasonal_factors', {})
-    
-    # Check each season
-    for season, data in seasonal_factors.items():
-        if month_name in data.get('months', []):
-            return data.get('demand_multiplier', 1.0)
-    
-    # Default to regular season if not found
-    return 1.0
+    month_mult = _derived(_MONTH_MULT_CACHE, market_data, _build_month_mult)
+    return month_mult[departure_date.month]
 
 
 def calculate_fuel_cost(distance_km: float, fuel_efficiency: float, fuel_price_per_liter: float) -> float:
@@ -105,6 +240,12 @@ def calculate_fuel_cost(distance_km: float, fuel_efficiency: float, fuel_price_p
     return fuel_consumed * fuel_price_per_liter
 
 
+# Day thresholds (inclusive upper bounds) and their multipliers:
+# last minute premium, standard pricing, early bird, super early discount
+_ADVANCE_BOOKING_DAYS = (7, 30, 60)
+_ADVANCE_BOOKING_FACTOR = (1.4, 1.1, 0.9, 0.85)
+
+
 def get_advance_booking_factor(days_in_advance: int) -> float:
     """
     Calculate pricing factor based on how far in advance the booking is made
@@ -115,14 +256,7 @@ def get_advance_booking_factor(days_in_advance: int) -> float:
     Returns:
         float: Pricing multiplier
     """
-    if days_in_advance <= 7:
-        return 1.4  # Last minute premium
-    elif days_in_advance <= 30:
-        return 1.1  # Standard pricing
-    elif days_in_advance <= 60:
-        return 0.9  # Early bird discount
-    else:
-        return 0.85  # Super early discount
+    return _ADVANCE_BOOKING_FACTOR[bisect.bisect_left(_ADVANCE_BOOKING_DAYS, days_in_advance)]
 
 
 def format_currency(amount: float, currency: str = "INR") -> str:
@@ -146,6 +280,18 @@ def format_currency(amount: float, currency: str = "INR") -> str:
         return f"{currency} {amount:,.2f}"
 
 
+_AIRPORT_INDEX_CACHE: Dict[int, Tuple[Dict, Dict[str, Dict]]] = {}
+
+
+def _build_airport_index(airports_data: Dict) -> Dict[str, Dict]:
+    """Build an {upper-cased code: airport} index for airports_data."""
+    index = {}
+    # First record for a code wins, as in the original linear scan
+    for airport in airports_data.get('airports', []):
+        index.setdefault(airport['code'].upper(), airport)
+    return index
+
+
 def validate_airport_code(airport_code: str, airports_data: Dict) -> bool:
     """
     Validate if airport code exists in the system
@@ -157,9 +303,8 @@ def validate_airport_code(airport_code: str, airports_data: Dict) -> bool:
     Returns:
         bool: True if valid, False otherwise
     """
-    airports = airports_data.get('airports', [])
-    valid_codes = [airport['code'] for airport in airports]
-    return airport_code.upper() in valid_codes
+    index = _derived(_AIRPORT_INDEX_CACHE, airports_data, _build_airport_index)
+    return airport_code.upper() in index
 
 
 def get_airport_info(airport_code: str, airports_data: Dict) -> Dict:
@@ -173,11 +318,8 @@ def get_airport_info(airport_code: str, airports_data: Dict) -> Dict:
     Returns:
         Dict: Airport information or empty dict if not found
     """
-    airports = airports_data.get('airports', [])
-    for airport in airports:
-        if airport['code'].upper() == airport_code.upper():
-            return airport
-    return {}
+    index = _derived(_AIRPORT_INDEX_CACHE, airports_data, _build_airport_index)
+    return index.get(airport_code.upper(), {})
 
 
 def calculate_flight_duration(distance_km: float, average_speed_kmh: float = 850) -> int:
@@ -197,6 +339,18 @@ def calculate_flight_duration(distance_km: float, average_speed_kmh: float = 850
     return int(total_hours * 60)
 
 
+# Multiplier per departure hour (index 0-23): off-peak 23:00-05:59 is 0.9,
+# peak 06:00-09:59 and 18:00-21:59 is 1.2, everything else 1.0
+_HOUR_FACTOR = (
+    (0.9,) * 6      # 00-05
+    + (1.2,) * 4    # 06-09
+    + (1.0,) * 8    # 10-17
+    + (1.2,) * 4    # 18-21
+    + (1.0,)        # 22
+    + (0.9,)        # 23
+)
+
+
 def get_time_based_factor(departure_time: str) -> float:
     """
     Get pricing factor based on time of day
@@ -207,17 +361,11 @@ def get_time_based_factor(departure_time: str) -> float:
     Returns:
         float: Time-based pricing multiplier
     """
-    hour = int(departure_time.split(':')[0])
-    
-    # Peak hours (6-9 AM, 6-9 PM) have higher pricing
-    if (6 <= hour <= 9) or (18 <= hour <= 21):
-        return 1.2
-    # Off-peak hours (late night/early morning) have lower pricing
-    elif (23 <= hour <= 23) or (0 <= hour <= 5):
-        return 0.9
-    # Regular hours
-    else:
-        return 1.0
+    hour = int(departure_time.partition(':')[0])
+    # Hours outside 0-23 got the regular rate before the table existed
+    if 0 <= hour <= 23:
+        return _HOUR_FACTOR[hour]
+    return 1.0
 
 
 def calculate_load_factor_adjustment(booked_seats: int, total_capacity: int) -> float:
@@ -246,6 +394,11 @@ def calculate_load_factor_adjustment(booked_seats: int, total_capacity: int) ->
         return 0.95  # Low demand, slight discount
 
 
+# Multiplier per weekday (0 = Monday ... 6 = Sunday): Friday / Sunday 1.15,
+# Monday / Thursday 1.1 (business travel), other days 0.95 (leisure)
+_DOW_FACTOR = (1.1, 0.95, 0.95, 1.1, 1.15, 0.95, 1.15)
+
+
 def get_day_of_week_factor(departure_date: datetime) -> float:
     """
     Get pricing factor based on day of the week
@@ -256,29 +409,25 @@ def get_day_of_week_factor(departure_date: datetime) -> float:
     Returns:
         float: Day-of-week pricing multiplier
     """
-    day_of_week = departure_date.weekday()  # 0 = Monday, 6 = Sunday
-    
-    # Friday, Sunday have higher pricing (business travel)
-    if day_of_week in [4, 6]:  # Friday, Sunday
-        return 1.15
-    # Monday, Thursday (business travel return)
-    elif day_of_week in [0, 3]:  # Monday, Thursday
-        return 1.1
-    # Tuesday, Wednesday, Saturday (leisure travel)
-    else:
-        return 0.95
+    return _DOW_FACTOR[departure_date.weekday()]
 
 
 # ---------------------------------------------------------------------------
 # Private / Business Aviation Specific Cost Utilities
 # ---------------------------------------------------------------------------
 
-def nearest_mt(mtow_kg: float) -> int:
+def nearest_mt(mtow_kg: float, half_even: bool = False) -> int:
     """Return billable weight in metric tons rounded to nearest integer (AERA practice).
 
+    Uses integer arithmetic and rounds half up (12,500 kg -> 13 MT); MTOW is
+    never negative. Pass half_even=True for Python round() semantics
+    (12,500 kg -> 12 MT).
+
     Example: 11,600 kg -> 12 MT
     """
-    return int(round(mtow_kg / 1000.0))
+    if half_even:
+        return int(round(mtow_kg / 1000.0))
+    return (int(mtow_kg) + 500) // 1000
 
 
 def parking_billable_hours(raw_hours: float, free_hours: float, buffer_min: int) -> float:
@@ -293,47 +442,147 @@ def parking_billable_hours(raw_hours: float, free_hours: float, buffer_min: int)
     return max(0.0, raw_hours - effective_free)
 
 
+def normalize_airport_cfg(airport_cfg: Dict) -> Dict:
+    """Return a copy of airport_cfg with numeric tariff fields coerced.
+
+    Numbers given as strings in JSON become floats (buffer_minutes an int),
+    and the optional udf / atc_navigation_flat keys are filled with 0.
+    Normalizing once at config load lets calc_airport_handling skip it per call.
+    """
+    udf_cfg = airport_cfg.get("udf", {"depart": 0, "arrive": 0})
+    return {
+        **airport_cfg,
+        "landing_per_mt": float(airport_cfg["landing_per_mt"]),
+        "landing_min": float(airport_cfg["landing_min"]),
+        "parking_per_mt_hr": float(airport_cfg["parking_per_mt_hr"]),
+        "free_hours": float(airport_cfg["free_hours"]),
+        "buffer_minutes": int(airport_cfg["buffer_minutes"]),
+        "udf": {
+            "depart": float(udf_cfg.get("depart", 0)),
+            "arrive": float(udf_cfg.get("arrive", 0)),
+        },
+        "atc_navigation_flat": float(airport_cfg.get("atc_navigation_flat", 0)),
+    }
+
+
+# Order of the values returned by airport_handling_components
+HANDLING_FIELDS = ("weight_mt_billed", "landing", "parking", "udf", "atc", "total")
+
+
+def airport_handling_constants(airport_cfg: Dict, normalized: bool = False) -> Tuple[float, ...]:
+    """Fold an airport tariff into the constants airport_handling_components uses.
+
+    Returns (landing_per_mt, landing_min, parking_per_mt_hr, effective_free_hours,
+    udf_depart, udf_arrive, atc_fee), where effective_free_hours already includes
+    the buffer. Build it once per airport to skip config lookups on every stop.
+    """
+    if not normalized:
+        airport_cfg = normalize_airport_cfg(airport_cfg)
+    udf_cfg = airport_cfg["udf"]
+    return (
+        airport_cfg["landing_per_mt"],
+        airport_cfg["landing_min"],
+        airport_cfg["parking_per_mt_hr"],
+        airport_cfg["free_hours"] + airport_cfg["buffer_minutes"] / 60.0,
+        udf_cfg["depart"],
+        udf_cfg["arrive"],
+        airport_cfg["atc_navigation_flat"],
+    )
+
+
+def airport_handling_components(
+    constants: Tuple[float, ...],
+    mtow_kg: float,
+    parking_hours: float,
+    pax_departing: int,
+    pax_arriving: int,
+) -> Tuple[int, float, float, float, float, float]:
+    """Handling formula shared by all callers; returns HANDLING_FIELDS order.
+
+    `constants` comes from airport_handling_constants. Returning a tuple lets
+    callers build their own record (e.g. a dataclass) positionally.
+    """
+    landing_per_mt, landing_min, per_mt_hr, effective_free, udf_depart, udf_arrive, atc_fee = constants
+
+    wt_mt = nearest_mt(mtow_kg)
+
+    # Landing fee (max of per-MT calc vs minimum)
+    landing_fee = max(wt_mt * landing_per_mt, landing_min)
+
+    # Parking fee (after free + buffer)
+    parking_fee = wt_mt * per_mt_hr * max(0.0, parking_hours - effective_free)
+
+    # UDF (departure + arrival passengers)
+    udf_fee = pax_departing * udf_depart + pax_arriving * udf_arrive
+
+    total_airport = landing_fee + parking_fee + udf_fee + atc_fee
+    return wt_mt, landing_fee, parking_fee, udf_fee, atc_fee, total_airport
+
+
 def calc_airport_handling(
     airport_cfg: Dict,
     mtow_kg: float,
     parking_hours: float,
     pax_departing: int,
     pax_arriving: int,
+    normalized: bool = False,
 ) -> Dict:
     """Compute single-airport handling cost components.
 
     Components: landing + parking + UDF (user dev. fee) + optional ATC/navigation flat.
     Expects airport_cfg keys: landing_per_mt, landing_min, parking_per_mt_hr,
     free_hours, buffer_minutes, udf {depart, arrive}, optional atc_navigation_flat.
+    The config is run through normalize_airport_cfg unless normalized=True
+    says the caller already did so.
     """
-    wt_mt = nearest_mt(mtow_kg)
+    constants = airport_handling_constants(airport_cfg, normalized)
+    components = airport_handling_components(
+        constants, mtow_kg, parking_hours, pax_departing, pax_arriving
+    )
+    return dict(zip(HANDLING_FIELDS, components))
+
+
+def calc_airport_handling_batch(
+    airport_cfgs: List[Dict],
+    mtow_kg: Sequence[float],
+    parking_hours: Sequence[float],
+    pax_departing: Sequence[int],
+    pax_arriving: Sequence[int],
+    normalized: bool = False,
+) -> Dict[str, np.ndarray]:
+    """Vectorized calc_airport_handling over many stops at once.
+
+    Each argument is aligned by stop index (airport_cfgs[i] is the tariff for
+    stop i). Configs are normalized like in calc_airport_handling unless
+    normalized=True (e.g. configs from services.airports()). Returns the
+    same components as calc_airport_handling, but as NumPy arrays with one
+    entry per stop. Requires numpy.
+    """
+    import numpy as np
 
-    # Landing fee (max of per-MT calc vs minimum)
-    landing_per_mt = float(airport_cfg["landing_per_mt"])
-    landing_min = float(airport_cfg["landing_min"])
-    landing_raw = wt_mt * landing_per_mt
-    landing_fee = max(landing_raw, landing_min)
+    constants = np.array(
+        [airport_handling_constants(c, normalized) for c in airport_cfgs], dtype=float
+    ).reshape(-1, 7)
+    landing_per_mt, landing_min, per_mt_hr, effective_free, udf_depart, udf_arrive, atc_fee = constants.T
 
-    # Parking fee (after free + buffer)
-    per_mt_hr = float(airport_cfg["parking_per_mt_hr"])
-    free_hours = float(airport_cfg["free_hours"])
-    buffer_minutes = int(airport_cfg["buffer_minutes"])
-    billable_hrs = parking_billable_hours(parking_hours, free_hours, buffer_minutes)
-    parking_fee = wt_mt * per_mt_hr * billable_hrs
+    # Same half-up integer rounding as nearest_mt
+    wt_mt = (np.asarray(mtow_kg, dtype=float).astype(np.int64) + 500) // 1000
 
-    # UDF (departure + arrival passengers)
-    udf_cfg = airport_cfg.get("udf", {"depart": 0, "arrive": 0})
-    udf_fee = pax_departing * float(udf_cfg.get("depart", 0)) + pax_arriving * float(udf_cfg.get("arrive", 0))
+    landing_fee = np.maximum(wt_mt * landing_per_mt, landing_min)
 
-    # Optional ATC / navigation flat fee
-    atc_fee = float(airport_cfg.get("atc_navigation_flat", 0))
+    billable_hrs = np.maximum(0.0, np.asarray(parking_hours, dtype=float) - effective_free)
+    parking_fee = wt_mt * per_mt_hr * billable_hrs
+
+    udf_fee = (
+        np.asarray(pax_departing, dtype=float) * udf_depart
+        + np.asarray(pax_arriving, dtype=float) * udf_arrive
+    )
 
-    total_airport = landing_fee + parking_fee + udf_fee + atc_fee
     return {
         "weight_mt_billed": wt_mt,
         "landing": landing_fee,
         "parking": parking_fee,
         "udf": udf_fee,
         "atc": atc_fee,
-        "total": total_airport,
-    }
\ No newline at end of file
+        "total": landing_fee + parking_fee + udf_fee + atc_fee,
+    }
@@ -10,37 +10,45 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 
 from .serializers import PricingInputSerializer
-from .services import pricing_service
+from .services import pricing_service, pricing_service_batch
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on quotes per batch request (endpoint is AllowAny)
+MAX_BATCH_SIZE = 50
+
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def get_price_estimate(request):
-    data = request.data.copy()
-
-    # move frontend keys -> serializer keys
-    if "from" in data:
-        data["origin"] = data.pop("from")
-    if "to" in data:
-        data["destination"] = data.pop("to")
-
-    serializer = PricingInputSerializer(data=data)
+    # `from` / `to` are mapped by the serializer, no copy of request.data needed
+    serializer = PricingInputSerializer(data=request.data)
 
     if not serializer.is_valid():
         return Response({"errors": serializer.errors}, status=400)
 
     validated = serializer.validated_data
 
-    # map back for service (FastAPI parity)
-    validated["from"] = validated.pop("origin")
-    validated["to"] = validated.pop("destination")
+    try:
+        result = pricing_service(validated)
+        return Response(result.as_dict(), status=200)
+    except Exception as e:
+        return Response({"error": str(e)}, status=500)
+
 
-   
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def get_price_estimate_batch(request):
+    # Same payload as get_price_estimate, but a JSON list of them
+    serializer = PricingInputSerializer(
+        data=request.data, many=True, allow_empty=False, max_length=MAX_BATCH_SIZE
+    )
+
+    if not serializer.is_valid():
+        return Response({"errors": serializer.errors}, status=400)
 
     try:
-        result = pricing_service(validated)
-        return Response(result, status=200)
+        results = pricing_service_batch(serializer.validated_data)
+        return Response([result.as_dict() for result in results], status=200)
     except Exception as e:
         return Response({"error": str(e)}, status=500)